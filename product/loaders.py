@@ -0,0 +1,61 @@
+from aiodataloader import DataLoader
+# DataLoader: collects .load()/.load_many() keys requested in the same event-loop tick and
+# resolves them with one batch_load_fn call; results are cached per key.
+
+from fastapi import Request
+# Request: the incoming request; its `state` holds the per-request loader instance.
+
+from fastapi.params import Depends
+# Depends: FastAPI dependency injection helper (e.g., for DB session).
+
+from sqlalchemy import select
+# select: SQLAlchemy 2.0 style query construct (executed via the session).
+
+from sqlalchemy.ext.asyncio import AsyncSession
+# AsyncSession: asyncio-aware SQLAlchemy ORM session type injected via dependency.
+
+from sqlalchemy.orm import load_only
+# load_only: restrict a SELECT to the listed columns (the primary key is always included).
+
+from .database import get_db
+# get_db: dependency that yields a DB session (defined in product/database.py).
+
+from . import models
+# models: SQLAlchemy models (database tables).
+
+
+class SellerLoader(DataLoader):
+    """
+    Batch seller lookups by id: every id requested in one tick becomes a single
+    `SELECT ... FROM sellers WHERE sellers.id IN (...)`, and each seller is fetched at most
+    once per request. Nested serializers can call .load(seller_id) freely without
+    reintroducing N+1 queries.
+    """
+
+    def __init__(self, db: AsyncSession):
+        super().__init__()
+        self.db = db
+
+    async def batch_load_fn(self, seller_ids):
+        # Only the columns DisplaySeller needs; the password hash stays in the DB.
+        result = await self.db.execute(
+            select(models.Seller)
+            .options(load_only(models.Seller.username, models.Seller.email))
+            .where(models.Seller.id.in_(seller_ids))
+        )
+        sellers = {seller.id: seller for seller in result.scalars()}
+        # DataLoader expects one result per key, in key order (None for a missing seller).
+        return [sellers.get(seller_id) for seller_id in seller_ids]
+
+
+async def get_seller_loader(request: Request, db: AsyncSession = Depends(get_db)) -> SellerLoader:
+    """
+    Dependency returning the SellerLoader for the current request.
+    - Stored on request.state, so every dependency/route in the same request shares one
+      loader (one batch queue, one cache), and nothing leaks between requests.
+    - async def on purpose: DataLoader binds to the running event loop when created.
+    """
+    loader = getattr(request.state, "seller_loader", None)
+    if loader is None:
+        loader = request.state.seller_loader = SellerLoader(db)
+    return loader
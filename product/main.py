@@ -1,8 +1,17 @@
+import asyncio
+# asyncio: wait for the DDL file lock in a worker thread so startup does not block the event loop.
+
+import fcntl
+# fcntl: POSIX advisory file locks (flock) used to serialize table creation across worker processes.
+
+from contextlib import asynccontextmanager
+# asynccontextmanager: turns an async generator into the lifespan handler FastAPI expects.
+
 from fastapi import FastAPI
 # FastAPI: main application class that creates the ASGI app and exposes routing/docs features.
 
 from .database import engine
-# engine: SQLAlchemy Engine instance configured in product/database.py used to connect to the DB.
+# engine: SQLAlchemy AsyncEngine instance configured in product/database.py used to connect to the DB.
 # Importing the engine here lets us call metadata.create_all(...) below to ensure tables exist.
 
 from .routers import product, seller, login
@@ -14,14 +23,36 @@ from . import models
 # Import models module to register SQLAlchemy model classes with the Base metadata.
 # models.Base (declarative base) holds the Table metadata for all defined models.
 
-# Ensure database tables exist by creating any missing tables defined in models.Base.
-# This runs synchronously at app import time; for production you might run migrations instead.
-models.Base.metadata.create_all(bind=engine)
+# Lock file next to the SQLite database (e.g. ./product.db.lock) used to serialize startup DDL.
+DDL_LOCK_PATH = f"{engine.url.database}.lock"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: code before `yield` runs once at startup, code after it at shutdown.
+    - Ensures database tables exist by creating any missing tables defined in models.Base.
+      The AsyncEngine cannot run create_all directly, so run_sync hands it a sync-style connection.
+    - With several workers (uvicorn --workers 4) every process runs this lifespan. An exclusive
+      flock on a sidecar lock file lets one worker run the DDL at a time; the others then find
+      the tables already there and create_all only checks for them.
+    - Disposes the engine's connection pool on shutdown.
+    """
+    with open(DDL_LOCK_PATH, "w") as lock_file:
+        await asyncio.to_thread(fcntl.flock, lock_file, fcntl.LOCK_EX)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(models.Base.metadata.create_all)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+    yield
+    await engine.dispose()
 
 
 # Create the FastAPI application instance with optional metadata used by the docs.
 # Title/description/terms_of_service/contact/license_info are shown in the OpenAPI docs.
 app = FastAPI(
+    lifespan=lifespan,
     title="Products Api",
     description="Get details for all the products on the website",
     terms_of_service='http://www.google.com',
@@ -48,8 +79,12 @@ app.include_router(seller.router)
 app.include_router(login.router)
 
 # Notes / recommendations:
-# - Running create_all at import-time is OK for development and learning, but use migrations
+# - Running create_all at startup is OK for development and learning, but use migrations
 #   (Alembic) in production to manage schema changes safely.
 # - Keep secrets/config (DB URL, credentials) outside source code (e.g., environment variables).
 # - When adding new routers, import them above and call app.include_router(new.router).
+# - Keep the default JSONResponse (no default_response_class=ORJSONResponse): for routes with a
+#   response_model FastAPI then dumps the Pydantic model straight to JSON bytes in Pydantic's
+#   Rust core, which is faster than orjson and skips the jsonable_encoder pass. Give new routes
+#   a response_model to get that path.
 # - The `app` object in this file is what Uvicorn/ASGI
\ No newline at end of file
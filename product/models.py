@@ -35,7 +35,8 @@ class Product(Base):
 class Seller(Base):
     __tablename__="sellers"
     id=Column(Integer,primary_key=True,index=True)
-    username=Column(String)
+    # username: looked up on every login, so index it; unique=True also stops duplicate accounts
+    username=Column(String, index=True, unique=True)
     email=Column(String)
     password=Column(String)
     products =relationship('Product',back_populates='seller')
\ No newline at end of file
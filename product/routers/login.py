@@ -1,19 +1,31 @@
 from fastapi import APIRouter, status, Response, HTTPException
 # APIRouter: create a modular set of routes; status/HTTPException used for HTTP responses and errors
-from sqlalchemy.orm import Session
-# Session: SQLAlchemy ORM session type for DB access
+from sqlalchemy import select, lambda_stmt
+# select: SQLAlchemy 2.0 style query construct (executed via the session)
+# lambda_stmt: caches the statement built inside a lambda, so its SQL is compiled only once
+from sqlalchemy.ext.asyncio import AsyncSession
+# AsyncSession: asyncio-aware SQLAlchemy ORM session type for DB access
 from fastapi.params import Depends
 # Depends: inject dependencies (DB session, OAuth form, token extraction)
 from ..database import get_db
 # get_db: dependency that yields a DB session (defined in product/database.py)
 from .. import models, schemas
 # models: SQLAlchemy models; schemas: Pydantic request/response schemas
-from passlib.context import CryptContext
-# CryptContext: helper to hash & verify passwords (we configure bcrypt below)
-from datetime import datetime, timedelta
-# datetime, timedelta: create expiry timestamps for tokens
-from jose import JWTError, jwt
-# jose.jwt: encode/decode JWTs; JWTError used to catch verification failures
+from ..security import verify_password
+# verify_password: checks a password against its bcrypt hash off the event loop (product/security.py)
+import base64
+# base64: base64url-encode the JWT segments
+import hashlib
+import hmac
+# hashlib, hmac: compute the HS256 (HMAC-SHA256) token signature
+import orjson
+# orjson: fast JSON encoder producing bytes, used for the token payload
+from functools import lru_cache
+# lru_cache: memoize verified token payloads so repeat requests skip signature checks
+import time
+# time: current epoch seconds used for the token expiry and to bucket the token cache
+import jwt
+# jwt (PyJWT): decode/verify JWTs; jwt.PyJWTError is the base class of all verification failures
 from fastapi.security import OAuth2PasswordBearer
 # OAuth2PasswordBearer: extracts bearer token from Authorization header (dependency)
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
@@ -26,89 +38,124 @@ SECRET_KEY = "1d3cfb274f62bb76681c38d656fb62af977db37922b7d2740dd817a8fb33550b"
 ALGORYTHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 20
 # Token expiration time in minutes
+SECRET_KEY_BYTES = SECRET_KEY.encode()
+# The HMAC key as bytes (PyJWT uses the UTF-8 bytes of SECRET_KEY the same way when verifying)
+TOKEN_CACHE_BUCKET_SECONDS = 10
+# How long a verified token payload may be served from the cache before it is re-verified
 
 # Router setup: prefix all endpoints with /login and tag them for docs
 router = APIRouter(tags=["Login"], prefix="/login")
 
-# Password hashing context: configure which hashing schemes to use and policy
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-# - schemes=["bcrypt"]: use bcrypt algorithm
-# - deprecated="auto": allow automatic handling of deprecated schemes
-
 # OAuth2 scheme helper: used by dependencies to read the Bearer token
 # tokenUrl is the endpoint where clients obtain a token (relative to API root)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+# Raised by get_current_user for every invalid token. It never changes, so it is built once
+# here instead of being allocated on each authenticated request.
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+def _b64url(data: bytes) -> bytes:
+    # JWT segments use unpadded base64url (RFC 7515)
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+# The JOSE header is the same for every token, so its encoded form is computed once.
+# hashlib.sha256 below implements HS256, so ALGORYTHM must stay "HS256".
+JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": ALGORYTHM, "typ": "JWT"}))
+
 def generate_token(data: dict) -> str:
     """
     Create a JWT token containing `data` as payload and an expiry claim.
     - Copies the input dict to avoid mutating the caller's object.
     - Adds an "exp" (expiry) claim set to now + ACCESS_TOKEN_EXPIRE_MINUTES.
-    - Encodes with jose.jwt using SECRET_KEY and ALGORYTHM.
+    - Signs header.payload with HMAC-SHA256 directly: only the payload is serialized per call,
+      the header comes from JWT_HEADER_B64. The result is a standard HS256 JWT that PyJWT
+      (and jwt.io) verify with the same SECRET_KEY.
     Returns the encoded JWT string.
     """
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    # 'exp' claim must be a UTC timestamp; jose accepts datetime objects and converts them.
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORYTHM)
+    # 'exp' claim must be a UTC timestamp in whole seconds since the epoch.
+    expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    to_encode = {**data, "exp": expire}
+    signing_input = JWT_HEADER_B64 + b"." + _b64url(orjson.dumps(to_encode))
+    signature = hmac.new(SECRET_KEY_BYTES, signing_input, hashlib.sha256).digest()
+    encoded_jwt = (signing_input + b"." + _b64url(signature)).decode("ascii")
     return encoded_jwt
 
-@router.post('')
-def login(
+@lru_cache(maxsize=4096)
+def _decode_cached(token: str, now_bucket: int) -> dict:
+    """
+    Decode and verify `token`, memoizing the payload per (token, time bucket).
+    - Clients send the same token on every request until it expires, so most calls are cache hits.
+    - `now_bucket` changes every TOKEN_CACHE_BUCKET_SECONDS, which forces a fresh jwt.decode and
+      therefore a fresh 'exp' check; an expired token is accepted for at most that long.
+    - Invalid tokens raise jwt.PyJWTError, and lru_cache never caches exceptions.
+    """
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORYTHM])
+
+@router.post('', response_model=schemas.Token)
+async def login(
     request: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Login endpoint.
     - Uses OAuth2PasswordRequestForm dependency to read 'username' and 'password' from form data.
       (This matches the standard OAuth2 password grant form data.)
     - Fetches the seller/user by username from the DB.
-    - Verifies the provided password against the hashed password using pwd_context.verify().
+    - Verifies the provided password against the hashed password using verify_password().
     - On success, generates and returns a JWT access token.
+    - response_model=schemas.Token lets FastAPI serialize the response straight to JSON bytes
+      with Pydantic's compiled serializer instead of jsonable_encoder + stdlib json.
     """
     # OAuth2PasswordRequestForm exposes .username and .password attributes
-    seller = db.query(models.Seller).filter(models.Seller.username == request.username).first()
+    # The lambda's code location is the cache key; `username` is extracted as a bound parameter,
+    # so every login reuses the same compiled SQL with a different value.
+    username = request.username
+    stmt = lambda_stmt(lambda: select(models.Seller).where(models.Seller.username == username))
+    result = await db.execute(stmt)
+    seller = result.scalars().first()
     if not seller:
         # 404 here means authentication failed (you may prefer 401 for auth failures)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found/Invalid User",
         )
-    # Verify the plaintext password against the stored hashed password
-    if not pwd_context.verify(request.password, seller.password):
+    # Verify the plaintext password against the stored hashed password.
+    # bcrypt is pure CPU work; verify_password runs it in a worker thread to keep the event loop free.
+    if not await verify_password(request.password, seller.password):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Invalid Password",
         )
-    # Generate JWT token with subject set to the seller's username
-    access_token = generate_token(data={"sub": seller.username})
+    # Generate JWT token with subject set to the seller's username; the seller's id travels
+    # along so routes can use it without looking the seller up again.
+    access_token = generate_token(data={"sub": seller.username, "seller_id": seller.id})
     return {"access_token": access_token, "token_type": "bearer"}
 
 def get_current_user(token: str = Depends(oauth2_scheme)):
     """
     Dependency that:
     - Extracts the token from the Authorization: Bearer <token> header (via oauth2_scheme).
-    - Decodes and verifies the token using jose.jwt and the SECRET_KEY/ALGORYTHM.
-    - Extracts the 'sub' claim (username) and wraps it in a TokenData schema.
+    - Decodes and verifies the token using PyJWT and the SECRET_KEY/ALGORYTHM
+      (through _decode_cached, so repeat tokens are verified at most once per bucket).
+    - Extracts the 'sub' claim (username) and the 'seller_id' claim and wraps them in a
+      TokenData schema ('seller_id' is None for tokens issued before it was added).
     - Raises a 401 HTTPException on any validation problem.
     - Returns a TokenData instance (or you can change to return the actual user model).
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
     try:
         # Decode validates the signature and the 'exp' claim automatically
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORYTHM])
+        payload = _decode_cached(token, int(time.time()) // TOKEN_CACHE_BUCKET_SECONDS)
         username: str = payload.get("sub")
         if username is None:
             # Missing subject claim → invalid token
             raise credentials_exception
         # Create a Pydantic TokenData object (defined in product/schemas.py)
-        token_data = schemas.TokenData(username=username)
-    except JWTError:
+        token_data = schemas.TokenData(username=username, seller_id=payload.get("seller_id"))
+    except jwt.PyJWTError:
         # Any JWT-related error (signature, expiry, malformed) -> unauthorized
         raise credentials_exception
     # Return the token_data so route handlers can receive it via dependency injection
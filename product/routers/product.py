@@ -1,28 +1,88 @@
-from fastapi import APIRouter, status, Response, HTTPException
+from fastapi import APIRouter, status, Response, HTTPException, Header
 # APIRouter: groups endpoints under a common prefix/tags for the main app.
 # status, Response, HTTPException: helpers for HTTP codes, custom responses and raising errors.
+# Header: declare a request header (If-None-Match) as a route parameter.
 
-from sqlalchemy.orm import Session
-# Session: SQLAlchemy ORM session type injected via dependency to talk to the DB.
+import hashlib
+# hashlib: blake2b digest of a product's fields, used as its ETag.
+
+from fastapi.responses import StreamingResponse
+# StreamingResponse: sends the response body from an (async) iterator chunk by chunk.
+
+from pydantic import TypeAdapter
+# TypeAdapter: validate/serialize a whole list of models in one call inside Pydantic's Rust core.
+
+from sqlalchemy import select, insert, delete as delete_stmt, update as update_stmt, text
+# select/insert/delete/update: SQLAlchemy 2.0 style statement constructs executed through the session.
+# delete/update are aliased because this module also defines route functions with those names.
+# text: a literal SQL statement, executed on a plain connection for the single-product read.
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+# AsyncSession: asyncio-aware SQLAlchemy ORM session type injected via dependency to talk to the DB.
+# AsyncConnection: asyncio-aware plain DB connection (no ORM) injected via dependency.
+
+from sqlalchemy.orm import load_only
+# load_only: restrict a SELECT to the listed columns (the primary key is always included).
 
 from fastapi.params import Depends
 # Depends: FastAPI dependency injection helper for DB/session/auth dependencies.
 
-from product.routers.login import get_current_user
-# Import the authentication dependency (returns token/user info).
+from product.routers.login import get_current_user, credentials_exception
+# Import the authentication dependency (returns token/user info) and its shared 401 error.
 # NOTE: this is an absolute import; ensure the package layout supports it.
 # Alternative: use relative import if structure requires (from .login import get_current_user).
 
-from ..database import get_db
+from ..database import get_db, get_connection
 # get_db: dependency that yields a DB session (defined in product/database.py).
+# get_connection: dependency that yields a plain pooled DB connection (no ORM Session).
+
+from ..loaders import SellerLoader, get_seller_loader
+# SellerLoader/get_seller_loader: per-request batching loader for sellers (product/loaders.py).
 
 from ..import models, schemas
 # Intention: import local modules 'models' and 'schemas'.
 # GOTCHA: this line is likely a typo — it should be `from .. import models, schemas`
 # (space required between .. and import). If kept as-is Python will raise a SyntaxError.
 
-from typing import List
+from typing import AsyncIterator, List, Optional
 # List: typing helper used for response_model annotation.
+# AsyncIterator: type of the generator that produces the streamed response body.
+# Optional: typing helper for the optional If-None-Match header.
+
+# Number of products fetched from the DB cursor (and sent to the client) per chunk.
+PRODUCTS_STREAM_CHUNK_SIZE = 500
+
+# Built once at import: TypeAdapter compiles its validator/serializer when constructed.
+display_products_adapter = TypeAdapter(List[schemas.DisplayProduct])
+
+# Single-product read: one indexed lookup joined to the seller, returning the columns
+# DisplayProduct needs plus id/price for the ETag. LEFT JOIN keeps products without a
+# seller visible to the 404 check.
+PRODUCT_BY_ID_SQL = text(
+    "SELECT products.id, products.name, products.description, products.price, "
+    "sellers.username, sellers.email "
+    "FROM products LEFT JOIN sellers ON sellers.id = products.seller_id "
+    "WHERE products.id = :id"
+)
+
+# Clients may reuse a cached product for 30s without asking; after that they revalidate
+# with If-None-Match and get a bodiless 304 while the ETag still matches.
+PRODUCT_CACHE_CONTROL = "private, max-age=30"
+
+
+def _product_etag(row) -> str:
+    # Strong ETag over every field that ends up in (or identifies) the response body,
+    # including the seller's, so a change to any of them produces a new tag.
+    fingerprint = f"{row.id}:{row.name}:{row.description}:{row.price}:{row.username}:{row.email}"
+    return '"' + hashlib.blake2b(fingerprint.encode(), digest_size=8).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match may be "*" or a comma-separated list of (possibly weak, W/"...") tags.
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
 
 # Create an APIRouter instance for all product-related endpoints.
 # prefix="/product" means every path here will be under /product (e.g., /product/{id}).
@@ -30,25 +90,35 @@ router = APIRouter(tags=["Products"], prefix="/product")
 
 
 @router.delete('/{id}')
-def delete(id: int, db: Session = Depends(get_db)):
+async def delete(id: int, db: AsyncSession = Depends(get_db)):
     """
     Delete a product by id.
     - id: path parameter parsed as int.
-    - db: injected SQLAlchemy Session from get_db dependency.
+    - db: injected SQLAlchemy AsyncSession from get_db dependency.
     Behavior:
     - Performs a filtered delete and commits.
     - Returns a simple JSON message on success.
-    Edge cases:
-    - Currently does not check if product existed before deletion.
-    - Consider returning 404 if no rows deleted.
+    - Raises 404 if no row was deleted. The DELETE's rowcount tells us whether the product
+      existed, so no separate SELECT round-trip is needed.
     """
-    db.query(models.Product).filter(models.Product.id == id).delete(synchronize_session=False)
-    db.commit()
+    result = await db.execute(
+        delete_stmt(models.Product).where(models.Product.id == id).execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'product with the id {id} is not available'
+        )
     return {'product deleted'}
 
 
 @router.get('s', response_model=List[schemas.DisplayProduct])
-def products(current_user: schemas.Seller = Depends(get_current_user), db: Session = Depends(get_db)):
+async def products(
+    current_user: schemas.Seller = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    seller_loader: SellerLoader = Depends(get_seller_loader),
+):
     """
     List products.
     - response_model: List[DisplayProduct] (Pydantic schema used to shape response).
@@ -59,63 +129,147 @@ def products(current_user: schemas.Seller = Depends(get_current_user), db: Sessi
     - The path is written as 's' which resolves to '/product s' (missing leading '/').
       It should probably be '/s' or better '/products' or simply '/'.
     """
-    products = db.query(models.Product).all()
-    return products
+    # One SELECT ... FROM products, plus at most one SELECT ... FROM sellers WHERE sellers.id IN (...)
+    # per chunk of PRODUCTS_STREAM_CHUNK_SIZE products (never one query per product); the
+    # SellerLoader batches the ids of a chunk and skips sellers already loaded for earlier chunks.
+    # Only the columns DisplayProduct needs are selected (plus seller_id, which the loader
+    # is keyed by); price and the seller's password hash stay in the DB.
+    # yield_per + stream_scalars read the rows lazily from the cursor instead of loading the
+    # whole table into memory; the response is written while the rows arrive.
+    result = await db.stream_scalars(
+        select(models.Product)
+        .options(
+            load_only(models.Product.name, models.Product.description, models.Product.seller_id),
+        )
+        .execution_options(yield_per=PRODUCTS_STREAM_CHUNK_SIZE)
+    )
+    # response_model above still documents the shape; the body is the same JSON array.
+    return StreamingResponse(_stream_products_json(result, seller_loader), media_type="application/json")
+
+
+async def _stream_products_json(result, seller_loader: SellerLoader) -> AsyncIterator[bytes]:
+    """
+    Serialize streamed Product rows as one JSON array, one chunk per partition.
+    - Sellers of a partition are resolved with one seller_loader.load_many() call (one batch).
+    - Each partition is read from the ORM rows and dumped to JSON bytes by one TypeAdapter
+      call, so the per-row loop runs in Pydantic's Rust core instead of in Python.
+    - Memory stays flat: only PRODUCTS_STREAM_CHUNK_SIZE ORM/Pydantic objects exist at a time.
+    - The DB session stays open until the body is sent because get_db's cleanup runs
+      after the response.
+    """
+    yield b"["
+    first = True
+    async for partition in result.partitions():
+        sellers = await seller_loader.load_many([product.seller_id for product in partition])
+        display_products = display_products_adapter.validate_python(
+            [
+                {"name": product.name, "description": product.description, "seller": seller}
+                for product, seller in zip(partition, sellers)
+            ]
+        )
+        # dump_json returns b"[...]"; drop the brackets so partitions join into a single array
+        rows = display_products_adapter.dump_json(display_products)[1:-1]
+        yield rows if first else b"," + rows
+        first = False
+    yield b"]"
 
 
 @router.get('/{id}', response_model=schemas.DisplayProduct)
-def product(id: int, response: Response, db: Session = Depends(get_db)):
+async def product(
+    id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    conn: AsyncConnection = Depends(get_connection),
+):
     """
     Retrieve a single product by id.
     - If product not found, raises 404 HTTPException with a helpful message.
-    - response param (fastapi.Response) is available if you prefer to set status codes manually.
+    - Sends an ETag (hash of the row) and Cache-Control header with the product. When the
+      client's If-None-Match already holds the current ETag, returns 304 Not Modified with
+      no body, skipping response validation and JSON serialization.
+    - response param (fastapi.Response) is used to set those headers on the normal 200 reply.
+    - This is the hottest read, so it skips the ORM entirely: one SQL statement on a plain
+      pooled connection, no Session/identity map and no ORM objects; the row is handed to
+      response_model as a plain dict.
     """
-    product = db.query(models.Product).filter(models.Product.id == id).first()
-    if not product:
+    result = await conn.execute(PRODUCT_BY_ID_SQL, {"id": id})
+    row = result.first()
+    if row is None:
         # Raising HTTPException lets FastAPI return a proper JSON error response and status.
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f'product with the id {id} is not available'
         )
-    return product
+    etag = _product_etag(row)
+    if _etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": PRODUCT_CACHE_CONTROL},
+        )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = PRODUCT_CACHE_CONTROL
+    return {
+        "name": row.name,
+        "description": row.description,
+        "seller": {"username": row.username, "email": row.email},
+    }
 
 
 @router.put('/{id}')
-def update(id: int, request: schemas.Product, db: Session = Depends(get_db)):
+async def update(id: int, request: schemas.Product, db: AsyncSession = Depends(get_db)):
     """
     Update a product.
     - request: Pydantic `schemas.Product` parsed from request body.
-    - Finds the row, updates it with request.model_dump() (Pydantic v2).
-    - Commits and returns a success message.
+    - Issues a single UPDATE with request.model_dump() (Pydantic v2) and commits.
+    - Returns a success message.
     Edge cases:
-    - If no product exists, current code does nothing (pass). Consider raising 404.
+    - If no product exists the UPDATE matches no rows; its rowcount is 0 and we raise 404,
+      so there is no separate existence SELECT.
     - Using `request.model_dump()` assumes Pydantic v2; for v1 use `request.dict()`.
     """
-    product = db.query(models.Product).filter(models.Product.id == id)
-    if not product.first():
-        pass  # consider: raise HTTPException(status_code=404, ...)
-    else:
-        product.update(request.model_dump())
-        db.commit()
-        return {'Product successfully updated'}
+    result = await db.execute(
+        update_stmt(models.Product)
+        .where(models.Product.id == id)
+        .values(**request.model_dump())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'product with the id {id} is not available'
+        )
+    return {'Product successfully updated'}
 
 
-@router.post('', status_code=status.HTTP_201_CREATED)
-def add(request: schemas.Product, db: Session = Depends(get_db)):
+@router.post('', status_code=status.HTTP_201_CREATED, response_model=schemas.Product)
+async def add(
+    request: schemas.Product,
+    current_user: schemas.TokenData = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
     """
-    Create a new product.
+    Create a new product owned by the authenticated seller.
     - request: Pydantic `schemas.Product` parsed from JSON body.
-    - Creates and commits a new SQLAlchemy `models.Product`.
-    - Currently sets seller_id=1 statically — replace with the authenticated user's id.
-    - Returns the request DTO; consider returning the created DB object or response_model instead.
+    - current_user: the caller's token data; its seller_id becomes the product's seller_id.
+      Tokens issued before the seller_id claim existed are rejected with 401 (log in again).
+    - Inserts with `INSERT ... RETURNING` (SQLite >= 3.35): the new row comes back from the
+      INSERT itself, so there is no db.refresh() SELECT afterwards.
+    - Returns the created product; response_model=schemas.Product makes FastAPI serialize it
+      with Pydantic's compiled JSON serializer.
     """
-    new_product = models.Product(
-        name=request.name,
-        description=request.description,
-        price=request.price,
-        seller_id=1  # placeholder: replace with actual seller id from auth dependency
+    if current_user.seller_id is None:
+        raise credentials_exception
+    result = await db.execute(
+        insert(models.Product)
+        .values(
+            name=request.name,
+            description=request.description,
+            price=request.price,
+            seller_id=current_user.seller_id,
+        )
+        .returning(models.Product)
     )
-    db.add(new_product)
-    db.commit()
-    db.refresh(new_product)
-    return request
\ No newline at end of file
+    new_product = result.scalar_one()
+    await db.commit()
+    return new_product
\ No newline at end of file
@@ -1,16 +1,20 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, status, HTTPException
 # APIRouter: groups related endpoints so they can be mounted on the main FastAPI app.
+# status, HTTPException: HTTP status codes and the exception used to return error responses.
 
-from sqlalchemy.orm import Session
-# Session: SQLAlchemy ORM session type; used for DB access injected via dependency.
+from sqlalchemy.exc import IntegrityError
+# IntegrityError: raised by the DB driver when a constraint (e.g. unique username) is violated.
+
+from sqlalchemy.ext.asyncio import AsyncSession
+# AsyncSession: asyncio-aware SQLAlchemy ORM session type; used for DB access injected via dependency.
 
 from .. import models, schemas
 # models: SQLAlchemy models (database tables).
 # schemas: Pydantic request/response schemas.
 # NOTE: keep the space: `from .. import ...` — otherwise Python raises a SyntaxError.
 
-from passlib.context import CryptContext
-# CryptContext: helper from passlib to hash and verify passwords using configured schemes.
+from ..security import hash_password
+# hash_password: bcrypt-hashes a password off the event loop (defined in product/security.py).
 
 from fastapi.params import Depends
 # Depends: FastAPI dependency injection helper (e.g., for DB session).
@@ -21,30 +25,26 @@ from ..database import get_db
 # Create a router scoped to seller-related endpoints
 router = APIRouter(tags=["Seller"])
 
-# Configure password hashing: use bcrypt and allow auto-handling of deprecated schemes.
-# - schemes=["bcrypt"] chooses bcrypt
-# - deprecated="auto" keeps compatibility and policy handling
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 @router.post('/seller', response_model=schemas.DisplaySeller)
-def create_seller(request: schemas.Seller, db: Session = Depends(get_db)):
+async def create_seller(request: schemas.Seller, db: AsyncSession = Depends(get_db)):
     """
     Create a new seller (user).
     - request: Pydantic model `schemas.Seller` parsed from request body (contains username, email, password).
-    - db: SQLAlchemy Session injected by get_db dependency.
+    - db: SQLAlchemy AsyncSession injected by get_db dependency.
     Steps:
-    1. Hash the plaintext password using pwd_context.hash(...) before storing.
+    1. Hash the plaintext password using hash_password(...) before storing.
        This ensures the DB never stores plaintext passwords.
     2. Create a new models.Seller instance with the hashed password.
-    3. Add, commit, refresh to persist and populate generated fields (e.g., id).
+    3. Add and commit to persist; the flush populates generated fields (e.g., id), and with
+       expire_on_commit=False the object stays loaded, so no refresh SELECT is needed.
     4. Return the created seller instance which will be serialized using the response_model.
     Security / privacy:
     - response_model=schemas.DisplaySeller should NOT include the password field so the API response omits it.
     - Never return or log plaintext passwords.
     """
-    # Hash the incoming plaintext password
-    hashedpassword = pwd_context.hash(request.password)
+    # Hash the incoming plaintext password (in a worker thread; bcrypt would block the event loop)
+    hashedpassword = await hash_password(request.password)
 
     # Create the SQLAlchemy model with hashed password
     new_seller = models.Seller(
@@ -55,8 +55,15 @@ def create_seller(request: schemas.Seller, db: Session = Depends(get_db)):
 
     # Persist to DB
     db.add(new_seller)
-    db.commit()
-    db.refresh(new_seller)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # sellers.username has a unique index, so a duplicate username fails at commit time
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f'seller with the username {request.username} already exists'
+        )
 
     # Return the created DB object; response_model controls which fields are sent back
     return new_seller
\ No newline at end of file
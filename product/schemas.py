@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 class Product(BaseModel):
@@ -7,17 +7,17 @@ class Product(BaseModel):
     price:int
 
 class DisplaySeller(BaseModel):
+    # from_attributes: read fields from ORM objects (earlier orm_mode)
+    # revalidate_instances='never': don't re-validate an already-built model when nesting it
+    model_config = ConfigDict(from_attributes=True, validate_assignment=False, revalidate_instances='never')
     username:str
     email:str
-    class Config:
-        from_attributes=True #earlier orm_mode
 
 class DisplayProduct(BaseModel):
+    model_config = ConfigDict(from_attributes=True, validate_assignment=False, revalidate_instances='never')
     name: str
     description: str
     seller:DisplaySeller
-    class Config:
-        from_attributes=True #earlier orm_mode
 
 class Seller(BaseModel):
     username:str
@@ -34,3 +34,4 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username:Optional[str]=None
+    seller_id:Optional[int]=None
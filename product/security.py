@@ -0,0 +1,31 @@
+import asyncio
+# asyncio: run the CPU-bound bcrypt work in a worker thread instead of on the event loop.
+
+from passlib.context import CryptContext
+# CryptContext: helper from passlib to hash and verify passwords using configured schemes.
+
+# Password hashing context shared by every router that hashes or verifies passwords.
+# Building a CryptContext loads the bcrypt backend and resolves its handlers, so the app
+# creates exactly one at import time and reuses it:
+# - schemes=["bcrypt"]: use bcrypt algorithm
+# - bcrypt__rounds=10: cost factor for new hashes (~4x cheaper than the default 12);
+#   existing 12-round hashes still verify because the cost is stored in the hash itself
+# - deprecated="auto": allow automatic handling of deprecated schemes
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=10, deprecated="auto")
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hash a plaintext password with pwd_context.
+    bcrypt takes tens of milliseconds of pure CPU, so it runs in a worker thread
+    (asyncio.to_thread); the event loop keeps accepting and serving other requests meanwhile.
+    """
+    return await asyncio.to_thread(pwd_context.hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Check a plaintext password against a stored bcrypt hash, off the event loop
+    (same reasoning as hash_password).
+    """
+    return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)